@@ -3,98 +3,301 @@ Factory Worker AI Monitor
 Analyzes video streams to track working hours and performance metrics
 """
 
+import os
+
+# Let FFmpeg decode with one thread per logical core (frame-level threading)
+# for H.264/HEVC files. Must be set before the first VideoCapture is created.
+os.environ.setdefault("OPENCV_FFMPEG_CAPTURE_OPTIONS", "threads;0|thread_type;frame")
+
 import cv2
 import numpy as np
 from datetime import datetime, timedelta
 import json
-from collections import defaultdict
+import queue
+import threading
 from typing import Dict, List, Tuple
 import time
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:
+    # Fall back to plain Python if numba isn't installed
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Capacity of the per-worker state arrays (worker ids index into them)
+MAX_WORKERS = 256
+
+# Performance score -> rating lookup: searchsorted into the thresholds
+# gives an index into the labels, replacing a per-worker if/elif chain
+RATING_THRESHOLDS = np.array([50, 70, 85])
+RATING_LABELS = np.array(["Needs Improvement", "Average", "Good", "Excellent"])
+
+
+@njit(cache=True)
+def _update_worker_states(indices, active_flags, seen, last_act, prod_time,
+                          idle_time, total_time, now, elapsed,
+                          idle_threshold, dt):
+    """
+    Update per-worker timing state for one frame
+
+    Runs as a compiled kernel over the parallel state arrays, replacing
+    per-worker dict lookups and Python float math in the 30 Hz loop.
+    """
+    for k in range(indices.shape[0]):
+        i = indices[k]
+        if not seen[i]:
+            seen[i] = True
+            last_act[i] = now
+        if active_flags[k]:
+            prod_time[i] += dt
+            last_act[i] = now
+        elif now - last_act[i] > idle_threshold:
+            idle_time[i] += dt
+        total_time[i] = elapsed
+
+
+@njit(cache=True)
+def _filter_components(stats, min_area, motion_threshold):
+    """
+    Filter connected components into worker detections
+
+    Takes the stats matrix from cv2.connectedComponentsWithStats and
+    emits per-worker arrays with no Python objects in the loop:
+    component indices, bounding boxes, motion intensities and active
+    flags. The stats already hold each component's exact foreground
+    pixel count, so motion intensity is just area over box area.
+
+    Components beyond MAX_WORKERS are dropped: ids index the fixed-size
+    state arrays, and with bounds checking off in compiled code an
+    oversized label would write out of bounds.
+    """
+    count = min(stats.shape[0] - 1, MAX_WORKERS)  # label 0 is the background
+    indices = np.empty(count, np.int64)
+    bboxes = np.empty((count, 4), np.int64)
+    intensities = np.empty(count)
+    active = np.empty(count, np.bool_)
+
+    k = 0
+    for label in range(1, min(stats.shape[0], MAX_WORKERS + 1)):
+        area = stats[label, 4]
+
+        # Filter by area (adjust based on camera distance)
+        if area > min_area:
+            x = stats[label, 0]
+            y = stats[label, 1]
+            w = stats[label, 2]
+            h = stats[label, 3]
+
+            intensity = area / (w * h) if (w * h) > 0 else 0.0
+
+            indices[k] = label - 1
+            bboxes[k, 0] = x
+            bboxes[k, 1] = y
+            bboxes[k, 2] = w
+            bboxes[k, 3] = h
+            intensities[k] = intensity
+            active[k] = intensity > motion_threshold
+            k += 1
+
+    return indices[:k], bboxes[:k], intensities[:k], active[:k]
+
+
 class FactoryWorkerMonitor:
-    def __init__(self, video_source=0):
+    def __init__(self, video_source=0, num_threads=None):
         """
         Initialize the Factory Worker Monitor
-        
+
         Args:
             video_source: Camera index or video file path
+            num_threads: Size of OpenCV's internal thread pool. Leave as
+                None for the default; cap it when running several
+                monitors on one machine (e.g. batch processing) so the
+                pools don't oversubscribe the cores
         """
         self.video_source = video_source
-        self.workers_data = defaultdict(lambda: {
-            'total_work_time': 0,
-            'idle_time': 0,
-            'productive_time': 0,
-            'activity_log': [],
-            'performance_score': 0
-        })
-        
+
+        if num_threads is not None:
+            cv2.setNumThreads(num_threads)
+
         # Activity thresholds
         self.motion_threshold = 25
         self.idle_threshold = 5  # seconds
         self.productivity_threshold = 0.7
+
+        # Run detection every Nth frame; activity changes on human
+        # timescales, so 10 Hz detection on a 30 fps stream loses nothing
+        self.detect_every = 3
+
+        # Per-frame time increment, assuming 30 FPS; hoisted so the hot
+        # loop never redoes the division
+        self._dt = 1.0 / 30.0
         
-        # Initialize background subtractor
+        # Initialize background subtractor (shadow detection off: we only
+        # use the binary mask, and classifying shadows adds a per-pixel pass)
         self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(
-            history=500, varThreshold=16, detectShadows=True
+            history=500, varThreshold=16, detectShadows=False
         )
+
+        # Detection runs at a fixed working resolution; worker-sized blobs
+        # don't need full input resolution and MOG2 cost scales per-pixel
+        self.work_w, self.work_h = 640, 360
+        self.scale_x = None  # computed from the first frame
+        self.scale_y = None
+
+        # Reused across frames to avoid per-frame allocations in the hot loop
+        self._kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+        self._fg_mask = None
+
+        # Offload MOG2 and morphology to the GPU through OpenCV's OpenCL
+        # T-API when a device is available (contour search stays on CPU)
+        self.use_opencl = cv2.ocl.haveOpenCL()
+        if self.use_opencl:
+            cv2.ocl.setUseOpenCL(True)
+
+        # Pre-rendered text stamps keyed by (label, color), so a worker's
+        # label is rasterized once per status change instead of every frame
+        self._label_cache = {}
         
         # Performance metrics
         self.start_time = None
         self.frame_count = 0
         self.activity_states = {}
-        
+
+        # Per-worker state as struct-of-arrays indexed by worker id,
+        # updated by the compiled kernel; dicts exist only in reports
+        self._seen = np.zeros(MAX_WORKERS, dtype=np.bool_)
+        self._prod_time = np.zeros(MAX_WORKERS)
+        self._idle_time = np.zeros(MAX_WORKERS)
+        self._total_time = np.zeros(MAX_WORKERS)
+        self._last_act = np.zeros(MAX_WORKERS)
+
+    def open_capture(self):
+        """
+        Open the video source with multi-threaded decode when possible
+
+        Video files go through the FFmpeg backend so the capture options
+        set at import time (one decode thread per logical core) apply,
+        with hardware acceleration if the platform offers it. Webcams
+        keep the default backend.
+
+        Returns:
+            cv2.VideoCapture for the configured source
+        """
+        if isinstance(self.video_source, str):
+            return cv2.VideoCapture(
+                self.video_source, cv2.CAP_FFMPEG,
+                [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+            )
+        return cv2.VideoCapture(self.video_source)
+
+
     def detect_workers(self, frame):
         """
-        Detect workers in the frame using background subtraction and contour detection
-        
+        Detect workers in the frame using background subtraction
+
+        Returns plain arrays rather than per-worker dicts so the 30 Hz
+        loop never builds Python objects; worker ids are integers and are
+        stringified only when a report is generated.
+
         Args:
             frame: Input video frame
-            
+
         Returns:
-            List of worker bounding boxes and activity status
+            Tuple of (indices, bboxes, intensities, active) arrays:
+            worker ids, (N, 4) x/y/w/h boxes in input-resolution pixels,
+            motion intensities and active flags
         """
-        # Apply background subtraction
-        fg_mask = self.bg_subtractor.apply(frame)
-        
-        # Remove shadows
-        fg_mask[fg_mask == 127] = 0
-        
-        # Morphological operations to reduce noise
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, kernel)
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_CLOSE, kernel)
-        
-        # Find contours
-        contours, _ = cv2.findContours(
-            fg_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
+        if self.scale_x is None:
+            self.scale_x = frame.shape[1] / self.work_w
+            self.scale_y = frame.shape[0] / self.work_h
+
+        # Downscale so MOG2 and morphology run at working resolution
+        small = cv2.resize(frame, (self.work_w, self.work_h),
+                           interpolation=cv2.INTER_AREA)
+
+        # Background subtraction + morphological open to reduce noise.
+        # A rectangular kernel hits OpenCV's separable SIMD fast path,
+        # and a single 3x3 open denoises the binary mask about as well
+        # as the old 5x5 open+close pair
+        if self.use_opencl:
+            # UMat inputs dispatch both stages to the OpenCL device;
+            # download the mask only for the CPU-bound contour stage
+            u_fg = self.bg_subtractor.apply(cv2.UMat(small))
+            cv2.morphologyEx(u_fg, cv2.MORPH_OPEN, self._kernel, dst=u_fg)
+            fg_mask = u_fg.get()
+        else:
+            # CPU path: apply into the reused mask buffer, open in place
+            self._fg_mask = self.bg_subtractor.apply(small, self._fg_mask, -1)
+            fg_mask = self._fg_mask
+            cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, self._kernel, dst=fg_mask)
+        
+        # Label foreground blobs: one connected-components pass returns
+        # bounding boxes and pixel counts for every blob, replacing
+        # findContours plus per-contour contourArea/boundingRect calls
+        binmask = (fg_mask > 0).view(np.uint8)
+        _, _, stats, _ = cv2.connectedComponentsWithStats(binmask, connectivity=8)
+
+        # Area threshold expressed in working-resolution pixels
+        area_scale = self.scale_x * self.scale_y
+        min_area = 1000 / area_scale  # Minimum worker size
+
+        indices, bboxes, intensities, active = _filter_components(
+            stats, min_area, self.motion_threshold / 100
         )
-        
-        workers = []
-        for i, contour in enumerate(contours):
-            area = cv2.contourArea(contour)
-            
-            # Filter by area (adjust based on camera distance)
-            if area > 1000:  # Minimum worker size
-                x, y, w, h = cv2.boundingRect(contour)
-                
-                # Calculate motion intensity
-                roi_mask = fg_mask[y:y+h, x:x+w]
-                motion_intensity = np.sum(roi_mask > 0) / (w * h) if (w * h) > 0 else 0
-                
-                # Determine activity status
-                is_active = motion_intensity > (self.motion_threshold / 100)
-                
-                workers.append({
-                    'id': f'worker_{i}',
-                    'bbox': (x, y, w, h),
-                    'area': area,
-                    'motion_intensity': motion_intensity,
-                    'is_active': is_active
-                })
-                
-        return workers
+
+        # Scale bounding boxes back to input resolution
+        scale = np.array([self.scale_x, self.scale_y, self.scale_x, self.scale_y])
+        bboxes = (bboxes * scale).astype(np.int64)
+
+        return indices, bboxes, intensities, active
     
-    def calculate_performance_metrics(self, worker_id: str, active_time: float, 
+    def draw_label(self, frame, label, x, y, color):
+        """
+        Draw a worker label using a cached pre-rendered stamp
+
+        Text rasterization is per-glyph work that the 30 Hz loop repeats
+        with identical input; render each (label, color) pair once and
+        blit the patch with a mask. Falls back to cv2.putText when the
+        stamp would land outside the frame.
+
+        Args:
+            frame: Frame to draw on
+            label: Label text
+            x, y: Text baseline anchor (same convention as cv2.putText)
+            color: BGR text color
+        """
+        stamp = self._label_cache.get((label, color))
+        if stamp is None:
+            (tw, th), baseline = cv2.getTextSize(
+                label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2
+            )
+            patch = np.zeros((th + baseline, tw, 3), np.uint8)
+            cv2.putText(patch, label, (0, th),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+            stamp = (patch, patch.any(axis=2), th)
+            self._label_cache[(label, color)] = stamp
+
+        patch, mask, th = stamp
+        y0, x0 = y - th, x
+        y1, x1 = y0 + patch.shape[0], x0 + patch.shape[1]
+
+        if y0 < 0 or x0 < 0 or y1 > frame.shape[0] or x1 > frame.shape[1]:
+            cv2.putText(frame, label, (x, y),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+            return
+
+        roi = frame[y0:y1, x0:x1]
+        roi[mask] = patch[mask]
+
+    def calculate_performance_metrics(self, worker_id: str, active_time: float,
                                      idle_time: float, total_time: float) -> Dict:
         """
         Calculate performance metrics for a worker
@@ -114,19 +317,10 @@ class FactoryWorkerMonitor:
         productivity_rate = (active_time / total_time) * 100
         idle_rate = (idle_time / total_time) * 100
         
-        # Performance score (0-100)
+        # Performance score (0-100); ratings are assigned in bulk by
+        # generate_report once all scores are known
         performance_score = min(100, productivity_rate * 1.2)
-        
-        # Performance rating
-        if performance_score >= 85:
-            rating = "Excellent"
-        elif performance_score >= 70:
-            rating = "Good"
-        elif performance_score >= 50:
-            rating = "Average"
-        else:
-            rating = "Needs Improvement"
-        
+
         return {
             'worker_id': worker_id,
             'total_time_minutes': round(total_time / 60, 2),
@@ -135,97 +329,194 @@ class FactoryWorkerMonitor:
             'productivity_rate': round(productivity_rate, 2),
             'idle_rate': round(idle_rate, 2),
             'performance_score': round(performance_score, 2),
-            'rating': rating,
             'effective_working_hours': round(active_time / 3600, 2)
         }
     
     def analyze_video_stream(self, duration_seconds=60, display=True):
         """
         Analyze video stream for specified duration
-        
+
         Args:
             duration_seconds: Duration to analyze (seconds)
             display: Whether to display video output
-            
+
         Returns:
             Performance report for all workers
         """
-        cap = cv2.VideoCapture(self.video_source)
-        
+        return self.process_video_threads(duration_seconds, display)
+
+    def process_video_threads(self, duration_seconds=60, display=True, prefetch=4):
+        """
+        Analyze the video stream with a three-stage threaded pipeline
+
+        A reader thread decodes frames, the main thread runs detection
+        (so the MOG2 state stays single-threaded), and a display thread
+        shows annotated frames. Bounded queues provide back-pressure so
+        decode of frame N+1 overlaps compute of N and display of N-1.
+
+        Args:
+            duration_seconds: Duration to analyze (seconds)
+            display: Whether to display video output
+            prefetch: Maximum frames buffered between pipeline stages
+
+        Returns:
+            Performance report for all workers
+        """
+        cap = self.open_capture()
+
         if not cap.isOpened():
             print("Error: Could not open video source")
             return None
-        
-        self.start_time = time.time()
+
+        # Monotonic clock for all interval math: immune to wall-clock
+        # adjustments and cheaper than time.time on some platforms
+        self.start_time = time.monotonic()
         end_time = self.start_time + duration_seconds
-        
+
         print(f"Starting analysis for {duration_seconds} seconds...")
         print("Press 'q' to quit early\n")
-        
-        frame_times = defaultdict(list)
-        last_activity_time = defaultdict(lambda: time.time())
-        
-        while time.time() < end_time:
-            ret, frame = cap.read()
-            
-            if not ret:
-                # Loop video if it's a file
-                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+        read_q = queue.Queue(maxsize=prefetch)
+        write_q = queue.Queue(maxsize=prefetch)
+        stop_event = threading.Event()
+
+        def read_frames():
+            """Decode frames and feed the compute stage"""
+            while not stop_event.is_set() and time.monotonic() < end_time:
+                ret, frame = cap.read()
+
+                if not ret:
+                    # Loop video if it's a file
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    continue
+
+                while not stop_event.is_set():
+                    try:
+                        read_q.put(frame, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+
+            stop_event.set()
+
+        def show_frames():
+            """Annotate and display frames, watching for the quit key
+
+            Drawing happens here so the compute thread never waits on
+            rasterization or GUI round-trips. Any display failure (e.g.
+            no GUI available) stops the whole pipeline rather than
+            leaving the compute thread running blind.
+            """
+            try:
+                while True:
+                    try:
+                        frame, indices, bboxes, active_flags, elapsed = \
+                            write_q.get(timeout=0.1)
+                    except queue.Empty:
+                        if stop_event.is_set():
+                            break
+                        continue
+
+                    # Draw bounding boxes
+                    for k in range(len(indices)):
+                        x, y, w, h = (int(v) for v in bboxes[k])
+                        is_active = bool(active_flags[k])
+                        color = (0, 255, 0) if is_active else (0, 0, 255)
+                        cv2.rectangle(frame, (x, y), (x+w, y+h), color, 2)
+
+                        # Add label
+                        status = "ACTIVE" if is_active else "IDLE"
+                        label = f"worker_{indices[k]}: {status}"
+                        self.draw_label(frame, label, x, y-10, color)
+
+                    # Display statistics
+                    cv2.putText(frame, f"Time: {elapsed:.1f}s", (10, 30),
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+                    cv2.putText(frame, f"Workers: {len(indices)}", (10, 60),
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+
+                    cv2.imshow('Factory Worker Monitor', frame)
+
+                    if cv2.waitKey(1) & 0xFF == ord('q'):
+                        break
+            except cv2.error as e:
+                print(f"Error: display failed ({e}); stopping analysis")
+            finally:
+                stop_event.set()
+
+        reader = threading.Thread(target=read_frames, daemon=True)
+        reader.start()
+
+        displayer = None
+        if display:
+            displayer = threading.Thread(target=show_frames, daemon=True)
+            displayer.start()
+
+        indices = np.empty(0, dtype=np.int64)
+        bboxes = np.empty((0, 4), dtype=np.int64)
+        active_flags = np.empty(0, dtype=np.bool_)
+
+        # Frames consumed since the last detection; sizes the time
+        # increment, since the empty-detection path re-detects early
+        frames_since_detect = 0
+
+        while not stop_event.is_set() and time.monotonic() < end_time:
+            try:
+                frame = read_q.get(timeout=0.1)
+            except queue.Empty:
                 continue
-            
+
             self.frame_count += 1
-            current_time = time.time()
-            
-            # Detect workers
-            workers = self.detect_workers(frame)
-            
-            # Update worker data
-            for worker in workers:
-                worker_id = worker['id']
-                is_active = worker['is_active']
-                
-                if is_active:
-                    self.workers_data[worker_id]['productive_time'] += 1/30  # Assuming 30 FPS
-                    last_activity_time[worker_id] = current_time
-                else:
-                    # Check if idle for more than threshold
-                    idle_duration = current_time - last_activity_time[worker_id]
-                    if idle_duration > self.idle_threshold:
-                        self.workers_data[worker_id]['idle_time'] += 1/30
-                
-                self.workers_data[worker_id]['total_work_time'] = (
-                    current_time - self.start_time
-                )
-                
-                # Draw bounding box
-                if display:
-                    x, y, w, h = worker['bbox']
-                    color = (0, 255, 0) if is_active else (0, 0, 255)
-                    cv2.rectangle(frame, (x, y), (x+w, y+h), color, 2)
-                    
-                    # Add label
-                    status = "ACTIVE" if is_active else "IDLE"
-                    label = f"{worker_id}: {status}"
-                    cv2.putText(frame, label, (x, y-10), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
-            
-            # Display statistics
+            frames_since_detect += 1
+
+            # One clock read and one elapsed computation per frame,
+            # shared by the state update and the overlay
+            current_time = time.monotonic()
+            elapsed = current_time - self.start_time
+
+            # Detect workers on every Nth frame; in between, reuse the
+            # last detections so display stays smooth without paying for
+            # background subtraction
+            if self.frame_count % self.detect_every == 0 or not len(indices):
+                indices, bboxes, _, active_flags = self.detect_workers(frame)
+
+                # Update worker timing state in one compiled pass. The
+                # increment covers exactly the frames consumed since the
+                # last detection (the empty path re-detects every frame)
+                if len(indices):
+                    _update_worker_states(
+                        indices, active_flags, self._seen, self._last_act,
+                        self._prod_time, self._idle_time, self._total_time,
+                        current_time, elapsed, self.idle_threshold,
+                        frames_since_detect * self._dt
+                    )
+                frames_since_detect = 0
+
+            # Hand the frame and current detections to the display
+            # thread, which does all annotation; headless runs skip
+            # every drawing call
             if display:
-                elapsed = current_time - self.start_time
-                cv2.putText(frame, f"Time: {elapsed:.1f}s", (10, 30),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-                cv2.putText(frame, f"Workers: {len(workers)}", (10, 60),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-                
-                cv2.imshow('Factory Worker Monitor', frame)
-                
-                if cv2.waitKey(1) & 0xFF == ord('q'):
-                    break
-        
+                item = (frame, indices, bboxes, active_flags, elapsed)
+                while not stop_event.is_set():
+                    try:
+                        write_q.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+
+        stop_event.set()
+        reader.join()
+        if displayer:
+            displayer.join()
+
         cap.release()
         if display:
-            cv2.destroyAllWindows()
-        
+            try:
+                cv2.destroyAllWindows()
+            except cv2.error:
+                # Headless build: the display thread already reported it
+                pass
+
         # Generate final report
         return self.generate_report()
     
@@ -236,45 +527,70 @@ class FactoryWorkerMonitor:
         Returns:
             Dictionary containing performance metrics for all workers
         """
-        total_elapsed = time.time() - self.start_time if self.start_time else 0
-        
+        total_elapsed = time.monotonic() - self.start_time if self.start_time else 0
+
+        seen_ids = np.flatnonzero(self._seen)
+
         report = {
             'session_info': {
                 'start_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                 'duration_seconds': round(total_elapsed, 2),
-                'total_workers': len(self.workers_data),
+                'total_workers': len(seen_ids),
                 'total_frames_processed': self.frame_count
             },
             'workers': []
         }
-        
-        for worker_id, data in self.workers_data.items():
+
+        for i in seen_ids:
             metrics = self.calculate_performance_metrics(
-                worker_id,
-                data['productive_time'],
-                data['idle_time'],
-                data['total_work_time']
+                f'worker_{i}',
+                float(self._prod_time[i]),
+                float(self._idle_time[i]),
+                float(self._total_time[i])
             )
             report['workers'].append(metrics)
-        
-        # Calculate aggregate statistics
+
+        # Assign ratings for all workers in one vectorized lookup
         if report['workers']:
-            avg_performance = np.mean([w['performance_score'] for w in report['workers']])
-            avg_productivity = np.mean([w['productivity_rate'] for w in report['workers']])
-            total_effective_hours = sum([w['effective_working_hours'] for w in report['workers']])
-            
+            scores = np.array([w['performance_score'] for w in report['workers']])
+            ratings = RATING_LABELS[
+                np.searchsorted(RATING_THRESHOLDS, scores, side='right')
+            ]
+            for worker, rating in zip(report['workers'], ratings):
+                worker['rating'] = str(rating)
+
+        # Calculate aggregate statistics straight from the state arrays
+        # instead of re-collecting them from the per-worker dicts
+        if len(seen_ids):
+            active = self._prod_time[seen_ids]
+            total = self._total_time[seen_ids]
+
+            productivity_rates = 100 * np.divide(
+                active, total, out=np.zeros_like(active), where=total > 0
+            )
+            performance_scores = np.minimum(100, productivity_rates * 1.2)
+
             report['aggregate_statistics'] = {
-                'average_performance_score': round(avg_performance, 2),
-                'average_productivity_rate': round(avg_productivity, 2),
-                'total_effective_working_hours': round(total_effective_hours, 2)
+                'average_performance_score': round(float(performance_scores.mean()), 2),
+                'average_productivity_rate': round(float(productivity_rates.mean()), 2),
+                'total_effective_working_hours': round(float(active.sum() / 3600), 2)
             }
         
         return report
     
     def save_report(self, report: Dict, filename='performance_report.json'):
         """Save report to JSON file"""
-        with open(filename, 'w') as f:
-            json.dump(report, f, indent=4)
+        if orjson is not None:
+            # C-implemented encoder, ~5-10x faster than json for large
+            # batch reports; also serializes NumPy scalars natively
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(
+                    report,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                ))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(report, f, indent=4)
         print(f"\nReport saved to {filename}")
         
     def print_report(self, report: Dict):